@@ -8,15 +8,116 @@
 
 import logging
 import pickle
-from typing import Dict, Any, List, Tuple
+import json
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple, Union
 import hashlib
-import warnings 
+import math
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 import numpy as np
 from termcolor import colored
 import yaml
 from qupyt.set_up import get_seq_dir
 
+# libyaml bindings are several times faster than the pure Python loader
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader  # type: ignore[assignment]
+
+# A pulse that is alone in its length group of add_pulses_batch is computed
+# with a scalar math.cos loop up to this many samples; below roughly 24-32
+# samples that beats the NumPy ufunc call overhead.
+_SCALAR_PULSE_MAX = 24
+
+# Recently built sequences keyed by the hash of their yaml source, so that
+# sweeping back and forth between a few sequences skips the numeric build.
+# Bounded to 16 entries and 512 MiB of waveform data ('final' arrays) in
+# total; a sequence larger than that on its own is not cached at all.
+_SEQUENCE_CACHE: "OrderedDict[str, Tuple[Any, ...]]" = OrderedDict()
+_SEQUENCE_CACHE_SIZE = 16
+_SEQUENCE_CACHE_BYTES = 512 * 2**20
+
+
+def _cache_payload(key: str, payload: Tuple[Any, ...]) -> None:
+    if payload[0].nbytes > _SEQUENCE_CACHE_BYTES:
+        return
+    _SEQUENCE_CACHE[key] = payload
+    while len(_SEQUENCE_CACHE) > _SEQUENCE_CACHE_SIZE or (
+        sum(cached[0].nbytes for cached in _SEQUENCE_CACHE.values())
+        > _SEQUENCE_CACHE_BYTES
+    ):
+        _SEQUENCE_CACHE.popitem(last=False)
+
+
+def _write_sequence(name: str, payload: Tuple[Any, ...]) -> None:
+    np.savez(get_seq_dir() / name, *payload)
+    logging.info(f"Pulse sequence written to {name}".ljust(65, ".") + "[done]")
+
+
+def _payload_hash(payload: Tuple[Any, ...]) -> str:
+    # finalhash covers the waveforms and sequencing; add what it leaves out
+    return hashlib.sha256(repr(payload[3:]).encode("utf-8")).hexdigest()
+
+
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+@lru_cache(maxsize=8192)
+def _time_to_index(time: float, samp_rate: float) -> Tuple[int, bool]:
+    """Convert a time in microseconds to the nearest sample index and
+    report whether the time falls on a sample."""
+    points = samp_rate * time * 1e-6
+    rounded = round(points)
+    # same tolerance as np.isclose, without the ufunc overhead
+    return rounded, abs(points - rounded) <= 1e-8 + 1e-5 * abs(rounded)
+
+
+def _warn_misaligned(points: float, rounded: int) -> None:
+    """Report a start or duration that is not an integer multiple of
+    samples. Nothing is formatted when warnings are filtered out."""
+    if not logging.getLogger().isEnabledFor(logging.WARNING):
+        return
+    print(
+        colored(
+            "WARNING! the start or duration time is not an integer multiple of samples".ljust(
+                65, "."
+            )
+            + "! [WARNING]",
+            "red",
+        )
+    )
+    print(
+        colored(
+            "WARNING! {} comp. to {}".format(points, rounded).ljust(65, ".")
+            + "! [WARNING]",
+            "red",
+        )
+    )
+    logging.warning(
+        "The start or duration is not an integer multiple of samples: %g comp. to %d",
+        points,
+        rounded,
+    )
+
+
+def _pack_source(
+    final: np.ndarray, analog: np.ndarray, markers: np.ndarray, si: int
+) -> None:
+    """Fill the analog and marker rows of AWG source si in final."""
+    final[:, 2 * si, :] = analog[:, si, :]
+    # pack 6 markers into one byte (bits 7→2); packbits fills
+    # the high bits first, so marker 1 lands on bit 7 directly
+    final[:, 2 * si + 1, :] = np.packbits(markers[:, si], axis=1, bitorder="big")[
+        :, 0, :
+    ]
+
 
 class PulseSequenceYaml:
     def __init__(
@@ -36,31 +137,78 @@ class PulseSequenceYaml:
         self.channel_mapping = channel_mapping
         self.samp_rate = float(samprate)  # samples per second
 
-    def _sequence_didnt_change(self) -> bool:
-        with open(self.yaml_file, "r", encoding="utf-8") as file:
-            sequence_instructions = yaml.safe_load(file)
+    def _cache_file(self) -> Path:
+        return self.yaml_file.with_suffix(".cache.json")
+
+    def _read_cache(self) -> Dict[str, Any]:
+        try:
+            with open(self._cache_file(), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _output_matches_cache(self, yaml_hash: str) -> bool:
+        """Check that the sequence file built from this exact yaml
+        is still the one on disk."""
+        cache = self._read_cache()
+        return cache.get("yaml_hash") == yaml_hash and cache.get(
+            "npz_mtime"
+        ) == _mtime(get_seq_dir() / "sequence.npz")
+
+    def _store_sequence(self, payload: Tuple[Any, ...], yaml_hash: str) -> None:
+        """Write sequence.npz unless the file on disk already holds this
+        exact payload. Skipping the write also leaves the file's mtime
+        alone, so nothing watching it re-uploads an identical sequence."""
+        npz_file = get_seq_dir() / "sequence.npz"
+        payload_hash = _payload_hash(payload)
+        cache = self._read_cache()
+        if not (
+            cache.get("payload_hash") == payload_hash
+            and cache.get("npz_mtime") == _mtime(npz_file)
+        ):
+            _write_sequence(npz_file.name, payload)
+        with open(self._cache_file(), "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "yaml_hash": yaml_hash,
+                    "payload_hash": payload_hash,
+                    "npz_mtime": _mtime(npz_file),
+                },
+                file,
+            )
+
+    def _read_yaml(self) -> Tuple[bytes, str]:
+        """Return the raw yaml bytes and the cache key built from them.
+        The build parses exactly these bytes, so key and content agree."""
+        raw = self.yaml_file.read_bytes()
+        # the build also depends on the AWG setup, so key on that too
+        yaml_hash = hashlib.blake2b(raw)
+        yaml_hash.update(
+            repr((self.channel_mapping, self.awg_sources, self.samp_rate)).encode("utf-8")
+        )
+        return raw, yaml_hash.hexdigest()
+
+    def _sequence_didnt_change(self, raw: bytes, yaml_hash: str) -> bool:
+        # compare raw bytes, the yaml only gets parsed when it changed
+        aux_file = self.yaml_file.with_suffix(".aux")
         try:
-            with open(
-                self.yaml_file.with_suffix(".aux"), "r", encoding="utf-8"
-            ) as file:
-                previous_sequence_instructions = yaml.safe_load(file)
-            with open(
-                self.yaml_file.with_suffix(".aux"), "w", encoding="utf-8"
-            ) as file:
-                yaml.dump(sequence_instructions, file)
-            return previous_sequence_instructions == sequence_instructions
+            previous_raw = aux_file.read_bytes()
         except FileNotFoundError:
-            with open(
-                self.yaml_file.with_suffix(".aux"), "w", encoding="utf-8"
-            ) as file:
-                yaml.dump(sequence_instructions, file)
+            previous_raw = None
+        if previous_raw != raw:
+            aux_file.write_bytes(raw)
             return False
+        return self._output_matches_cache(yaml_hash)
 
     def translate_yaml_to_numeric_instructions(self) -> None:
-        if self._sequence_didnt_change():
+        raw, yaml_hash = self._read_yaml()
+        if self._sequence_didnt_change(raw, yaml_hash):
             return
-        with open(self.yaml_file, "r", encoding="utf-8") as file:
-            sequence_instructions = yaml.safe_load(file)
+        if yaml_hash in _SEQUENCE_CACHE:
+            _SEQUENCE_CACHE.move_to_end(yaml_hash)
+            self._store_sequence(_SEQUENCE_CACHE[yaml_hash], yaml_hash)
+            return
+        sequence_instructions = yaml.load(raw, Loader=SafeLoader)
         sequence_order = sequence_instructions["sequencing_order"]
         sequencing_repeats = sequence_instructions["sequencing_repeats"]
         duration = float(sequence_instructions["total_duration"])
@@ -79,20 +227,23 @@ class PulseSequenceYaml:
                 if isinstance(mapped_channel, str):
                     flag_channels[block].append(mapped_channel)
                     continue
-                for pulse in pulses.values():
-                    seq.add_pulse(
-                        i,
-                        float(pulse["start"]),
-                        float(pulse["duration"]),
-                        channel=mapped_channel,
-                        inputtype="time",
-                        amplitude=float(pulse["amplitude"]),
-                        freq=(float(pulse["frequency"]), float(pulse["phase"])),
-                    )
-        seq.flag_channels = pickle.dumps(flag_channels)
+                pulses = list(pulses.values())
+                seq.add_pulses_batch(
+                    i,
+                    [float(pulse["start"]) for pulse in pulses],
+                    [float(pulse["duration"]) for pulse in pulses],
+                    channel=mapped_channel,
+                    inputtype="time",
+                    amplitudes=[float(pulse["amplitude"]) for pulse in pulses],
+                    frequencies=[float(pulse["frequency"]) for pulse in pulses],
+                    phases=[float(pulse["phase"]) for pulse in pulses],
+                )
+        seq.flag_channels = flag_channels
         seq.sequencer = sequencing_repeats
         seq.sequencernames = sequence_order
-        seq.make("sequence.npz")
+        payload = seq.build()
+        self._store_sequence(payload, yaml_hash)
+        _cache_payload(yaml_hash, payload)
 
 
 class PulseSequence:
@@ -106,7 +257,7 @@ class PulseSequence:
         self.samp_rate = samprate  # samples per second
         self.min_time = 1 / samprate
         self.num_points = int(samprate * duration * 1e-6)
-        self.time = np.linspace(0, duration, self.num_points)  # in microseconds
+        self.dt_us = 1e6 / samprate  # sample spacing in microseconds
         self.numseqs = numseqs
         self.awg_sources = awg_sources
 
@@ -127,44 +278,43 @@ class PulseSequence:
                 + "[WARNING]"
             )
 
-        # 7 => 1 analog + 6 digital markers
-        self.pulses = np.zeros((numseqs, 7 * len(self.awg_sources), self.num_points))
+        # each source has 1 analog channel + 6 digital markers. They are
+        # kept apart: float32 is ample for 14/16 bit AWG DACs, and markers
+        # only ever need one bit per sample.
+        self.analog = np.zeros(
+            (numseqs, len(self.awg_sources), self.num_points), dtype=np.float32
+        )
+        self.markers = np.zeros(
+            (numseqs, len(self.awg_sources), 6, self.num_points), dtype=bool
+        )
         self.sequencer = None
         self.sequencernames = None
-        self.flag_channels: Any
+        self.flag_channels: Dict[str, Any] = {}
         self.warning_counter = 0
         self.properties = {"Values": "None"}
 
     def time_to_index(self, time: float) -> int:
-        points = self.samp_rate * time * 1e-6
-        if not np.isclose(points, int(round(points))):
-            print(
-                colored(
-                    "WARNING! the start or duration time is not an integer multiple of samples".ljust(
-                        65, "."
-                    )
-                    + "! "
-                    "[WARNING]",
-                    "red",
-                )
-            )
-            print(
-                colored(
-                    "WARNING! {} comp. to {}".format(points, int(round(points))).ljust(
-                        65, "."
-                    )
-                    + "! [WARNING]",
-                    "red",
-                )
-            )
-            logging.warning(
-                "The start of duration is not an integer mulitple of samples".ljust(
-                    65, "."
-                )
-                + "[WARNING]"
-            )
+        rounded, aligned = _time_to_index(time, self.samp_rate)
+        if not aligned:
+            _warn_misaligned(self.samp_rate * time * 1e-6, rounded)
             self.warning_counter += 1
-        return int(round(points))
+        return rounded
+
+    def _pulse_view(self, numseq, channel: int, start: int, duration: int):
+        """Return the buffer slice a pulse writes to, and the plane of
+        its source it lies in (0 analog, 1-6 markers)."""
+        source, plane = divmod(channel, 7)
+        if plane == 0:
+            buffer = self.analog[:, source]
+        else:
+            buffer = self.markers[:, source, plane - 1]
+        # numseq is either one sequence index or a (first, stop) range
+        if isinstance(numseq, (tuple, list)):
+            first, stop = numseq
+            target = buffer[first:stop, int(start) : int(start + duration)]
+        else:
+            target = buffer[numseq, int(start) : int(start + duration)]
+        return target, plane
 
     def add_pulse(
         self,
@@ -181,7 +331,8 @@ class PulseSequence:
         start & duration:time in microseconds or points.
         inputtype:       'time'   => input in microseconds
                          'points' => points
-        channel can be 0 or 5 and will write to AWG source 1 or 2.
+        channel can be 0 or 7 and will write to AWG source 1 or 2,
+        channel % 7 in 1..6 selects one of the markers of that source.
         """
         if inputtype == "time":
             start = self.time_to_index(start)
@@ -189,25 +340,101 @@ class PulseSequence:
         else:
             logging.info("Interpreting input as number of sampling points!")
 
-        if freq is not None:
+        target, plane = self._pulse_view(numseq, channel, start, duration)
+
+        if freq is not None and freq[0] != 0:
             frequency, phase = freq
             frequency *= 10**-6
-            fr = np.cos(
-                2 * np.pi * frequency * self.time[int(start) : int(start + duration)]
-                + phase
-            )
+            # amplitude * cos(2 pi f t + phase), evaluated in place in a
+            # single double precision phase buffer; only the final waveform
+            # is rounded to the pulse buffer
+            first = int(start)
+            omega = 2 * np.pi * frequency * self.dt_us
+            phase_arg = np.arange(first, first + target.shape[-1], dtype=np.float64)
+            phase_arg *= omega
+            phase_arg += phase
+            np.cos(phase_arg, out=phase_arg)
+            if plane == 0:
+                # scale and store in the same pass
+                np.multiply(phase_arg, amplitude, out=target)
+            else:
+                phase_arg *= amplitude
+                np.greater(phase_arg, 0, out=target)
         else:
-            fr = 1
-        try:
-            self.pulses[
-                numseq[0] : numseq[1], channel, int(start) : int(start + duration)
-            ] = (amplitude * fr)
-        except Exception:
-            self.pulses[numseq, channel, int(start) : int(start + duration)] = (
-                amplitude * fr
-            )
+            # without a carrier the pulse is flat
+            level = amplitude * np.cos(freq[1]) if freq is not None else amplitude
+            target[...] = level if plane == 0 else level > 0
 
-    def make(self, name: str) -> None:
+    def add_pulses_batch(
+        self,
+        numseq,
+        starts: List[float],
+        durations: List[float],
+        channel: int = 0,
+        inputtype: str = "time",
+        amplitudes: Union[float, List[float]] = 1.0,
+        frequencies: Union[float, List[float]] = 0.0,
+        phases: Union[float, List[float]] = 0.0,
+    ) -> None:
+        """Add several pulses to one channel, equivalent to calling
+        add_pulse for each of them in order.
+        Pulses with a carrier and equal length share one 2-D cosine
+        evaluation, which is what XY8 like trains of pi pulses consist of.
+        amplitudes, frequencies (Hz) and phases are per pulse or scalars.
+        """
+        if inputtype == "time":
+            starts = [self.time_to_index(start) for start in starts]
+            durations = [self.time_to_index(duration) for duration in durations]
+        else:
+            logging.info("Interpreting input as number of sampling points!")
+        starts = np.asarray(starts, dtype=np.int64)
+        durations = np.asarray(durations, dtype=np.int64)
+        amplitudes = np.broadcast_to(amplitudes, starts.shape).astype(np.float64)
+        frequencies = np.broadcast_to(frequencies, starts.shape) * 10**-6
+        phases = np.broadcast_to(phases, starts.shape).astype(np.float64)
+
+        # without a carrier a pulse is flat at amplitude * cos(phase)
+        waveforms: List[Any] = list(amplitudes * np.cos(phases))
+        carrier = frequencies != 0
+        for length in np.unique(durations[carrier]):
+            group = np.flatnonzero(carrier & (durations == length))
+            if len(group) == 1 and length <= _SCALAR_PULSE_MAX:
+                # a lone short pulse is quicker with math.cos than through
+                # the per call overhead of arange and several ufuncs
+                index = group[0]
+                first = int(starts[index])
+                omega = float(2 * np.pi * frequencies[index] * self.dt_us)
+                amplitude = float(amplitudes[index])
+                phase = float(phases[index])
+                waveforms[index] = [
+                    amplitude * math.cos((first + k) * omega + phase)
+                    for k in range(length)
+                ]
+                continue
+            omega = 2 * np.pi * frequencies[group] * self.dt_us
+            # sample indices times omega plus phase, in the same order of
+            # operations as add_pulse so both give identical samples
+            wave = np.arange(length, dtype=np.float64) + starts[group][:, None]
+            wave *= omega[:, None]
+            wave += phases[group][:, None]
+            np.cos(wave, out=wave)
+            wave *= amplitudes[group][:, None]
+            for row, index in enumerate(group):
+                waveforms[index] = wave[row]
+
+        # write in the given order so overlapping pulses overwrite as before
+        for start, duration, waveform in zip(starts, durations, waveforms):
+            target, plane = self._pulse_view(numseq, channel, start, duration)
+            if np.ndim(waveform):
+                waveform = waveform[: target.shape[-1]]
+            if plane == 0:
+                target[...] = waveform
+            else:
+                np.greater(waveform, 0, out=target)
+
+    def build(self) -> Tuple[Any, ...]:
+        """Assemble the AWG output arrays and return the sequence.npz
+        payload without writing it."""
         logging.info(
             f"There where {self.warning_counter} warnings in PS generation".ljust(
                 65, "."
@@ -215,34 +442,38 @@ class PulseSequence:
             + "[done]"
         )
         final = np.zeros((self.numseqs, 2 * len(self.awg_sources), self.num_points))
-        for si, src in enumerate(self.awg_sources):
-            base = 7*si
-            # analog channel
-            final[:, 2*si, :] = self.pulses[:, base, :]
-            # pack 6 markers into one byte (bits 7→2)
-            packed = np.zeros_like(self.pulses[:, 0, :], dtype=np.uint8)
-            for bit_offset in range(6):
-                marker = self.pulses[:, base + 1 + bit_offset, :] > 0
-                packed |= (marker.astype(np.uint8) << (7 - bit_offset))
-            final[:, 2*si+1, :] = packed
-
-        hash1 = hashlib.sha1(final.tobytes()).hexdigest()
-        hash2 = hashlib.sha1(str(self.sequencer).encode("utf-8")).hexdigest()
-        hash3 = hashlib.sha1(str(self.sequencernames).encode("utf-8")).hexdigest()
+        # sources write disjoint rows of final and NumPy releases the GIL
+        # while copying and packing, so each source gets its own thread
+        with ThreadPoolExecutor(max_workers=max(1, len(self.awg_sources))) as pool:
+            list(
+                pool.map(
+                    partial(_pack_source, final, self.analog, self.markers),
+                    range(len(self.awg_sources)),
+                )
+            )
+
+        # hash the array buffer in place instead of copying it via tobytes()
+        hash1 = hashlib.sha256(memoryview(final).cast("B")).hexdigest()
+        hash2 = hashlib.sha256(str(self.sequencer).encode("utf-8")).hexdigest()
+        hash3 = hashlib.sha256(str(self.sequencernames).encode("utf-8")).hexdigest()
         hash4 = hash1 + hash2 + hash3
-        finalhash = hashlib.sha1(hash4.encode("utf-8")).hexdigest()
+        finalhash = hashlib.sha256(hash4.encode("utf-8")).hexdigest()
 
-        file_dir = get_seq_dir()
-        np.savez(
-            file_dir / name,
+        payload = (
             final,
             self.sequencer,
             self.sequencernames,
             finalhash,
             self.properties,
-            self.flag_channels,
+            # stored pickled so the npz itself never needs allow_pickle
+            pickle.dumps(self.flag_channels),
         )
-        logging.info(f"Pulse sequence written to {name}".ljust(65, ".") + "[done]")
+        return payload
+
+    def make(self, name: str) -> Tuple[Any, ...]:
+        payload = self.build()
+        _write_sequence(name, payload)
+        return payload
 
 
 class PulseBlasterSequence:
@@ -251,10 +482,10 @@ class PulseBlasterSequence:
         channel_mapping: Dict[str, Any],
         yaml_file: Path = get_seq_dir() / "sequence.yaml",
     ) -> None:
-        self.event_times: List[float] = []
+        self.event_times = np.empty(0, dtype=np.float64)
         self.event_durations: List[float] = []
-        self.event_channel: List[str] = []
-        self.events: List[str] = []
+        self.event_channel = np.empty(0, dtype=object)
+        self.events = np.empty(0, dtype="U4")
         self.channel_bits: List[int] = []
         self.segment_durations: List[float] = []
         self.channel_mapping = channel_mapping
@@ -264,7 +495,7 @@ class PulseBlasterSequence:
 
     def _load_yaml_sequence(self, path: Path) -> Dict[str, Any]:
         with open(path, "r", encoding="utf-8") as file:
-            yaml_sequence = yaml.safe_load(file)
+            yaml_sequence = yaml.load(file, Loader=SafeLoader)
         return yaml_sequence
 
     def parse_pulse_sequence_file(self) -> None:
@@ -284,91 +515,98 @@ class PulseBlasterSequence:
         combines the individual sub seqeunces into one long sequence that
         can be uploaded to the pulse blaster card in one go.
         """
-        channel_bits = []
-        bits_duration = []
+        # tile each block into preallocated arrays and concatenate once,
+        # instead of growing lists by a repeated copy per block
+        channel_bits = [np.empty(0, dtype=np.int64)]
+        bits_duration = [np.empty(0, dtype=np.float64)]
         sequencing_info = zip(
             self.yaml_sequence["sequencing_order"],
             self.yaml_sequence["sequencing_repeats"],
         )
         for sequence_block, block_repeats in sequencing_info:
-            channel_bits += self.ps[sequence_block]["channel_bits"] * block_repeats
-            bits_duration += self.ps[sequence_block]["durations"] * block_repeats
+            block = self.ps[sequence_block]
+            channel_bits.append(
+                np.tile(np.asarray(block["channel_bits"], dtype=np.int64), block_repeats)
+            )
+            bits_duration.append(
+                np.tile(np.asarray(block["durations"], dtype=np.float64), block_repeats)
+            )
 
-        return channel_bits, bits_duration
+        return (
+            np.concatenate(channel_bits).tolist(),
+            np.concatenate(bits_duration).tolist(),
+        )
 
     def _reset_attributes(self) -> None:
-        self.event_times = []
+        self.event_times = np.empty(0, dtype=np.float64)
         self.event_durations = []
-        self.event_channel = []
-        self.events = []
+        self.event_channel = np.empty(0, dtype=object)
+        self.events = np.empty(0, dtype="U4")
         self.channel_bits = []
         self.segment_durations = []
 
-    def _append_event(self, channel: str, pulse: Dict[str, float]) -> None:
-        self.event_times.append(pulse["start"])
-        self.event_times.append(pulse["start"] + pulse["duration"])
-        self.event_channel.append(channel)
-        self.event_channel.append(channel)
-        self.events.append("up")
-        self.events.append("down")
-
-    def _parse_channel(self, channel: str, channel_pulses: Dict[str, Any]) -> None:
-        for pulse in channel_pulses.values():
-            self._append_event(channel, pulse)
+    def _parse_channel(
+        self, channel: str, channel_pulses: Dict[str, Any], offset: int
+    ) -> int:
+        """Write the up/down events of one channel into the event arrays
+        starting at offset and return the offset after them."""
+        num_pulses = len(channel_pulses)
+        starts = np.fromiter(
+            (pulse["start"] for pulse in channel_pulses.values()),
+            dtype=np.float64,
+            count=num_pulses,
+        )
+        durations = np.fromiter(
+            (pulse["duration"] for pulse in channel_pulses.values()),
+            dtype=np.float64,
+            count=num_pulses,
+        )
+        end = offset + 2 * num_pulses
+        self.event_times[offset:end:2] = starts
+        self.event_times[offset + 1 : end : 2] = starts + durations
+        self.event_channel[offset:end] = channel
+        self.events[offset:end:2] = "up"
+        self.events[offset + 1 : end : 2] = "down"
+        return end
 
     def _parse_block(self, ps_block: Dict[str, Any]) -> None:
+        num_events = 2 * sum(len(pulses) for pulses in ps_block.values())
+        self.event_times = np.empty(num_events, dtype=np.float64)
+        self.event_channel = np.empty(num_events, dtype=object)
+        self.events = np.empty(num_events, dtype="U4")
+        offset = 0
         for channel, channel_pulses in ps_block.items():
-            self._parse_channel(channel, channel_pulses)
+            offset = self._parse_channel(channel, channel_pulses, offset)
 
     def _sort_pulses(self) -> None:
-        self.event_times, self.event_channel, self.events = zip(
-            *sorted(zip(self.event_times, self.event_channel, self.events))
-        )
+        # order by time, ties broken by channel and then event name, i.e.
+        # the same order as sorting the (time, channel, event) tuples
+        order = np.lexsort((self.events, self.event_channel, self.event_times))
+        self.event_times = self.event_times[order]
+        self.event_channel = self.event_channel[order]
+        self.events = self.events[order]
 
     def _get_event_durations(self) -> None:
-        self.event_durations = [
-            i - j for i, j in zip(self.event_times[1:], self.event_times[:-1])
-        ]
+        self.event_durations = np.diff(self.event_times).tolist()
         if self.total_duration == "ignore":
             pass
         elif self.event_times[-1] != self.total_duration:
             self.event_durations.append(self.total_duration - self.event_times[-1])
 
-    def _event_to_sign(self, event: str) -> int:
-        if event == "up":
-            return 1
-        if event == "down":
-            return -1
-        raise ValueError(f'No event {event}, options are "up" or "down"')
-
     def _compute_channel_bits(self) -> None:
-        for i, _ in enumerate(self.event_durations):
-            prev_val = self.channel_bits[-1] if self.channel_bits else 0
-            self.channel_bits.append(
-                prev_val
-                + 2 ** (self.channel_mapping[self.event_channel[i]])
-                * self._event_to_sign(self.events[i])
-            )
+        # the channel state after each event is the running sum of
+        # +-2**channel over all events so far
+        mapped = np.array(
+            [self.channel_mapping[channel] for channel in self.event_channel],
+            dtype=np.int64,
+        )
+        signs = np.where(self.events == "up", 1, -1)
+        channel_bits = np.cumsum(signs * (1 << mapped))[: len(self.event_durations)]
+        event_durations = np.asarray(self.event_durations)
         if self.event_times[0] != 0:
-            self.channel_bits.insert(0, 0)
-            self.event_durations.insert(0, self.event_times[0])
-        self._pop_uncessary_entries()
-
-    def _pop_uncessary_entries(self) -> None:
-        # find all zero‐length segments
-        indices_to_pop = [
-            idx
-            for idx, dur in enumerate(self.event_durations)
-            if dur == 0
-        ]
-        # remove in reverse order so earlier pops don't shift later ones
-        for pop_index in sorted(indices_to_pop, reverse=True):
-            if 0 <= pop_index < len(self.event_durations):
-                self.event_durations.pop(pop_index)
-            else:
-                warnings.warn(f"Skipping bad event_durations index {pop_index} (len={len(self.event_durations)})")
-            # guard channel_bits as well
-            if 0 <= pop_index < len(self.channel_bits):
-                self.channel_bits.pop(pop_index)
-            else:
-                warnings.warn(f"Skipping bad channel_bits index {pop_index} (len={len(self.channel_bits)})")
+            channel_bits = np.concatenate(([0], channel_bits))
+            event_durations = np.concatenate(([self.event_times[0]], event_durations))
+        # drop zero-length segments, e.g. from coinciding events
+        keep = event_durations != 0
+        self.channel_bits = channel_bits[keep].tolist()
+        self.event_durations = event_durations[keep].tolist()